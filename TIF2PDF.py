@@ -11,22 +11,26 @@
 依赖安装：
     pip install pillow pymupdf python-pptx
 
+可选加速（压缩模式下使用libjpeg-turbo编码JPEG）：
+    pip install PyTurboJPEG
+    （PyTurboJPEG依赖numpy，会一并安装；未安装时程序不需要numpy）
+
 创建时间：2025-12-27
 """
 
 import os
+import collections
+from contextlib import closing
+from functools import lru_cache, partial
 import sys
-import glob
 import threading
+from concurrent.futures import ThreadPoolExecutor
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox, scrolledtext
 from PIL import Image
-import fitz  # PyMuPDF
-from pptx import Presentation
-from pptx.util import Inches, Pt
-from pptx.enum.shapes import MSO_SHAPE
 from typing import List, Optional, Tuple
 import io
+import struct
 
 
 # 支持的图片格式
@@ -35,6 +39,147 @@ SUPPORTED_FORMATS = {
     '.tif', '.tiff', '.webp', '.ico', '.ppm'
 }
 
+# 日志框刷新间隔（毫秒）
+LOG_FLUSH_INTERVAL_MS = 100
+
+# 扩展名元组，供str.endswith一次匹配全部后缀
+SUPPORTED_SUFFIXES = tuple(sorted(SUPPORTED_FORMATS))
+
+# 支持对象流压缩（Document.save的use_objstms参数）的最低MuPDF版本
+OBJSTMS_MIN_VERSION = (1, 24)
+
+# 格式过滤选项对应的扩展名
+FILTER_MAP = {
+    "仅PNG/JPG": ('.jpg', '.jpeg', '.png'),
+    "仅TIF": ('.tif', '.tiff'),
+    "仅BMP": ('.bmp',),
+}
+
+# JPEG中携带图片尺寸的SOF标记（排除DHT/JPG/DAC）
+_JPEG_SOF_MARKERS = set(range(0xC0, 0xD0)) - {0xC4, 0xC8, 0xCC}
+
+
+def _jpeg_dims(f) -> Optional[Tuple[int, int]]:
+    """遍历JPEG标记段，从SOF段读取宽高"""
+    f.seek(2)
+    while True:
+        byte = f.read(1)
+        if not byte:
+            return None
+        if byte != b'\xff':
+            continue
+        marker = f.read(1)
+        while marker == b'\xff':  # 跳过填充字节
+            marker = f.read(1)
+        if not marker:
+            return None
+        code = marker[0]
+        if code == 0x01 or 0xD0 <= code <= 0xD7:  # 无长度字段的标记
+            continue
+        if code in (0xD9, 0xDA):  # 到达EOI/SOS仍未找到SOF
+            return None
+        seg_len = struct.unpack('>H', f.read(2))[0]
+        if code in _JPEG_SOF_MARKERS:
+            height, width = struct.unpack('>xHH', f.read(5))
+            return width, height
+        f.seek(seg_len - 2, os.SEEK_CUR)
+
+
+def _tiff_dims(f, head: bytes) -> Optional[Tuple[int, int]]:
+    """读取TIFF第一个IFD中的ImageWidth/ImageLength标签"""
+    endian = '<' if head[:2] == b'II' else '>'
+    ifd_offset = struct.unpack(endian + 'I', head[4:8])[0]
+    f.seek(ifd_offset)
+    count = struct.unpack(endian + 'H', f.read(2))[0]
+    entries = f.read(count * 12)
+    width = height = None
+    for pos in range(0, len(entries) - 11, 12):
+        tag, typ = struct.unpack(endian + 'HH', entries[pos:pos + 4])
+        if tag not in (256, 257):
+            continue
+        if typ == 3:  # SHORT
+            value = struct.unpack(endian + 'H', entries[pos + 8:pos + 10])[0]
+        elif typ == 4:  # LONG
+            value = struct.unpack(endian + 'I', entries[pos + 8:pos + 12])[0]
+        else:
+            return None
+        if tag == 256:
+            width = value
+        else:
+            height = value
+    if width and height:
+        return width, height
+    return None
+
+
+def _header_dims(f, head: bytes) -> Optional[Tuple[int, int]]:
+    """根据文件头魔数解析图片宽高，无法识别时返回None"""
+    if head[:8] == b'\x89PNG\r\n\x1a\n' and head[12:16] == b'IHDR':
+        return struct.unpack('>II', head[16:24])
+    if head[:2] == b'\xff\xd8':
+        return _jpeg_dims(f)
+    if head[:6] in (b'GIF87a', b'GIF89a'):
+        return struct.unpack('<HH', head[6:10])
+    if head[:2] == b'BM':
+        if struct.unpack('<I', head[14:18])[0] == 12:  # OS/2 BITMAPCOREHEADER
+            return struct.unpack('<HH', head[18:22])
+        width, height = struct.unpack('<ii', head[18:26])
+        return width, abs(height)
+    if head[:4] == b'RIFF' and head[8:12] == b'WEBP':
+        chunk = head[12:16]
+        if chunk == b'VP8 ' and head[23:26] == b'\x9d\x01\x2a':
+            width, height = struct.unpack('<HH', head[26:30])
+            return width & 0x3FFF, height & 0x3FFF
+        if chunk == b'VP8L' and head[20] == 0x2F:
+            bits = struct.unpack('<I', head[21:25])[0]
+            return (bits & 0x3FFF) + 1, ((bits >> 14) & 0x3FFF) + 1
+        if chunk == b'VP8X':
+            return (int.from_bytes(head[24:27], 'little') + 1,
+                    int.from_bytes(head[27:30], 'little') + 1)
+        return None
+    if head[:4] in (b'II*\x00', b'MM\x00*'):
+        return _tiff_dims(f, head)
+    return None
+
+
+def _probe_dims(path: str) -> Tuple[int, int]:
+    """读取图片宽高（只解析文件头，格式无法识别时回退到PIL）"""
+    try:
+        with open(path, 'rb') as f:
+            dims = _header_dims(f, f.read(64))
+    except (OSError, struct.error, IndexError):
+        dims = None
+
+    if dims and dims[0] > 0 and dims[1] > 0:
+        return dims
+
+    with Image.open(path) as img:
+        return img.size
+
+
+@lru_cache(maxsize=8192)
+def _cached_dims(path: str, mtime_ns: int) -> Tuple[int, int]:
+    """带缓存的_probe_dims，以修改时间作为键的一部分，文件被修改后自动失效"""
+    return _probe_dims(path)
+
+
+def _bounded_map(executor, fn, items, window):
+    """按顺序提交任务并逐个产出future，同时在途的任务不超过window个
+
+    调用方通过future.result()取得结果或异常；生成器关闭时取消尚未开始的任务
+    """
+    pending = collections.deque()
+    try:
+        for item in items:
+            pending.append(executor.submit(fn, item))
+            if len(pending) >= window:
+                yield pending.popleft()
+        while pending:
+            yield pending.popleft()
+    finally:
+        for future in pending:
+            future.cancel()
+
 
 class ImageConverterGUI:
     """图片转换器GUI主类"""
@@ -47,6 +192,20 @@ class ImageConverterGUI:
         
         # 数据存储
         self.image_files = []
+        self._meta = {}  # 文件路径 -> (修改时间, 文件大小, 图片尺寸)
+        self._display_text = {}  # 文件路径 -> 列表显示文本（不含序号）
+        self._scan_cache = None  # ((文件夹, 过滤条件, 修改时间), 文件列表)
+        self._log_q = collections.deque()  # 待写入日志框的消息
+        
+        # PyMuPDF/python-pptx/PyTurboJPEG在首次转换时才导入，加快启动
+        self._fitz_mod = None
+        self._pptx_mod = None
+        self._tj_loaded = False
+        self._tj_encode = None
+        
+        # 常驻的转换线程，转换任务依次提交执行
+        self._exec = ThreadPoolExecutor(max_workers=1, thread_name_prefix='converter')
+        self._closed = threading.Event()  # 窗口已关闭，转换线程应尽快退出
         self.selected_format = tk.StringVar(value="PDF")
         
         # 设置样式
@@ -57,6 +216,9 @@ class ImageConverterGUI:
         
         # 绑定事件
         self.bind_events()
+        
+        # 定时刷新日志
+        self.root.after(LOG_FLUSH_INTERVAL_MS, self._flush_log)
     
     def setup_styles(self):
         """设置界面样式"""
@@ -179,20 +341,26 @@ class ImageConverterGUI:
         options_frame = ttk.Frame(bottom_frame)
         options_frame.pack(fill=tk.X, pady=5)
         
+        # PDF/PPT选项分别放在同一网格单元的两个框架中，切换时用grid_remove隐藏
+        self.pdf_opts_frame = ttk.Frame(options_frame)
+        self.pdf_opts_frame.grid(row=0, column=0, sticky=tk.W)
+        self.ppt_opts_frame = ttk.Frame(options_frame)
+        self.ppt_opts_frame.grid(row=0, column=0, sticky=tk.W)
+        
         # PDF选项
         self.pdf_quality_var = tk.StringVar(value="无损")
-        self.pdf_quality_combo = ttk.Combobox(options_frame, textvariable=self.pdf_quality_var,
+        self.pdf_quality_combo = ttk.Combobox(self.pdf_opts_frame, textvariable=self.pdf_quality_var,
                                                values=["无损（推荐）", "中等质量", "高压缩"],
                                                width=20, state="readonly")
         self.pdf_quality_combo.pack(side=tk.LEFT, padx=(10, 0))
         
         # PPT选项
         self.ppt_layout_var = tk.StringVar(value="空白页")
-        self.ppt_layout_combo = ttk.Combobox(options_frame, textvariable=self.ppt_layout_var,
+        self.ppt_layout_combo = ttk.Combobox(self.ppt_opts_frame, textvariable=self.ppt_layout_var,
                                               values=["空白页", "图片居中", "全屏填充"],
                                               width=20, state="readonly")
         self.ppt_layout_combo.pack(side=tk.LEFT, padx=(10, 0))
-        self.ppt_layout_combo.pack_forget()  # 初始隐藏
+        self.ppt_opts_frame.grid_remove()  # 初始隐藏
         
         # ==================== 转换按钮和进度区域 ====================
         action_frame = ttk.Frame(main_frame)
@@ -225,6 +393,7 @@ class ImageConverterGUI:
         """绑定事件处理"""
         self.listbox.bind('<Double-Button-1>', self.on_listbox_double_click)
         self.listbox.bind('<<ListboxSelect>>', self.on_listbox_select)
+        self.root.protocol('WM_DELETE_WINDOW', self.on_close)
     
     def browse_folder(self):
         """浏览选择文件夹"""
@@ -265,22 +434,43 @@ class ImageConverterGUI:
             return
         
         format_filter = self.format_var.get()
-        self.image_files = []
+        suffixes = FILTER_MAP.get(format_filter, SUPPORTED_SUFFIXES)
         
-        # 扫描图片文件
-        for ext in SUPPORTED_FORMATS:
-            if format_filter == "仅PNG/JPG" and ext not in ['.jpg', '.jpeg', '.png']:
-                continue
-            elif format_filter == "仅TIF" and ext not in ['.tif', '.tiff']:
-                continue
-            elif format_filter == "仅BMP" and ext not in ['.bmp']:
-                continue
+        # 文件夹和过滤条件未变化时复用上次的文件列表，跳过目录遍历（增删文件会改变文件夹的修改时间）
+        scan_key = (folder, format_filter, os.stat(folder).st_mtime_ns)
+        cache_hit = self._scan_cache is not None and self._scan_cache[0] == scan_key
+        if cache_hit:
+            self.image_files = list(self._scan_cache[1])
             
-            pattern = os.path.join(folder, f'*{ext}')
-            self.image_files.extend(glob.glob(pattern))
-        
-        # 去重并排序
-        self.image_files = sorted(list(set(self.image_files)))
+            # 原地修改文件不会改变文件夹的修改时间，逐个检查文件，只重新读取有变化的文件
+            try:
+                for filepath in self.image_files:
+                    stat_result = os.stat(filepath)
+                    meta = self._meta.get(filepath)
+                    if meta is None or meta[:2] != (stat_result.st_mtime_ns, stat_result.st_size):
+                        self._meta[filepath] = self._read_meta(filepath, stat_result)
+                        self._display_text.pop(filepath, None)
+            except OSError:
+                cache_hit = False
+        
+        if not cache_hit:
+            # 扫描图片文件（一次遍历目录，同时缓存文件大小和图片尺寸）
+            self.image_files = []
+            self._meta = {}
+            self._display_text = {}
+            with os.scandir(folder) as entries:
+                for entry in entries:
+                    # 与glob一致，跳过隐藏文件
+                    if entry.name.startswith('.') or not entry.is_file():
+                        continue
+                    if not entry.name.lower().endswith(suffixes):
+                        continue
+                    
+                    self.image_files.append(entry.path)
+                    self._meta[entry.path] = self._read_meta(entry.path, entry.stat())
+            
+            self.image_files.sort()
+            self._scan_cache = (scan_key, tuple(self.image_files))
         
         # 更新列表显示
         self.update_listbox()
@@ -299,24 +489,44 @@ class ImageConverterGUI:
             self.output_entry.delete(0, tk.END)
             self.output_entry.insert(0, output_path)
     
-    def update_listbox(self):
-        """更新图片列表显示"""
-        self.listbox.delete(0, tk.END)
-        
-        for i, filepath in enumerate(self.image_files):
-            filename = os.path.basename(filepath)
-            file_size = os.path.getsize(filepath) / (1024 * 1024)  # MB
-            
-            # 尝试获取图片尺寸
-            try:
-                with Image.open(filepath) as img:
-                    width, height = img.size
-                    size_info = f"  [{width}x{height}]"
-            except:
-                size_info = ""
+    def _read_meta(self, filepath, stat_result):
+        """读取列表显示所需的文件信息：(修改时间, 文件大小, 图片尺寸)"""
+        try:
+            dims = _cached_dims(filepath, stat_result.st_mtime_ns)
+        except Exception:
+            dims = None
+        return stat_result.st_mtime_ns, stat_result.st_size, dims
+    
+    def _row_text(self, index):
+        """生成列表第index行的显示文本（文件信息部分按路径缓存）"""
+        filepath = self.image_files[index]
+        text = self._display_text.get(filepath)
+        
+        if text is None:
+            meta = self._meta.get(filepath)
+            if meta is None:
+                meta = self._meta[filepath] = self._read_meta(filepath, os.stat(filepath))
+            _, file_size, dims = meta
             
-            display_text = f"{i+1:3d}. {filename} ({file_size:.2f} MB){size_info}"
-            self.listbox.insert(tk.END, display_text)
+            size_info = f"  [{dims[0]}x{dims[1]}]" if dims else ""
+            text = f"{os.path.basename(filepath)} ({file_size / (1024 * 1024):.2f} MB){size_info}"
+            self._display_text[filepath] = text
+        
+        return f"{index+1:3d}. {text}"
+    
+    def _refresh_rows(self, indices):
+        """只重绘指定的列表行"""
+        for i in sorted(indices):
+            self.listbox.delete(i)
+            self.listbox.insert(i, self._row_text(i))
+    
+    def update_listbox(self, start=0):
+        """更新图片列表显示（从第start行开始重绘）"""
+        self.listbox.delete(start, tk.END)
+        
+        rows = [self._row_text(i) for i in range(start, len(self.image_files))]
+        if rows:
+            self.listbox.insert(tk.END, *rows)
         
         self.count_label.config(text=str(len(self.image_files)))
     
@@ -327,10 +537,15 @@ class ImageConverterGUI:
             index = selection[0]
             if index < len(self.image_files):
                 filepath = self.image_files[index]
-                try:
-                    os.startfile(filepath)
-                except:
-                    self.log(f"无法打开文件: {filepath}")
+                # 系统查找关联程序可能较慢，放到后台线程避免界面卡顿
+                threading.Thread(target=self._open_file, args=(filepath,), daemon=True).start()
+    
+    def _open_file(self, filepath):
+        """用系统默认程序打开文件（在后台线程中运行）"""
+        try:
+            os.startfile(filepath)
+        except Exception:
+            self.log(f"无法打开文件: {filepath}")
     
     def on_listbox_select(self, event):
         """列表选择事件"""
@@ -358,11 +573,13 @@ class ImageConverterGUI:
         if not selected or selected[0] == 0:
             return
         
+        changed = set()
         for i in selected:
             if i > 0:
                 self.image_files[i], self.image_files[i-1] = self.image_files[i-1], self.image_files[i]
+                changed.update((i - 1, i))
         
-        self.update_listbox()
+        self._refresh_rows(changed)
         for i in selected:
             self.listbox.selection_set(i - 1 if i > 0 else i)
     
@@ -372,11 +589,13 @@ class ImageConverterGUI:
         if not selected or selected[-1] == len(self.image_files) - 1:
             return
         
+        changed = set()
         for i in reversed(selected):
             if i < len(self.image_files) - 1:
                 self.image_files[i], self.image_files[i+1] = self.image_files[i+1], self.image_files[i]
+                changed.update((i, i + 1))
         
-        self.update_listbox()
+        self._refresh_rows(changed)
         for i in selected:
             self.listbox.selection_set(i + 1 if i < len(self.image_files) - 1 else i)
     
@@ -391,7 +610,8 @@ class ImageConverterGUI:
             if i < len(self.image_files):
                 del self.image_files[i]
         
-        self.update_listbox()
+        # 第一个被删除项之前的行不变，只重绘其后的行（序号需要更新）
+        self.update_listbox(start=selected[0])
         self.log(f"已移除 {len(selected)} 个项目")
     
     def on_format_change(self):
@@ -399,8 +619,8 @@ class ImageConverterGUI:
         format_type = self.selected_format.get()
         
         if format_type == "PDF":
-            self.pdf_quality_combo.pack(side=tk.LEFT, padx=(10, 0))
-            self.ppt_layout_combo.pack_forget()
+            self.pdf_opts_frame.grid()
+            self.ppt_opts_frame.grid_remove()
             
             # 更新输出路径扩展名
             current_output = self.output_entry.get()
@@ -409,8 +629,8 @@ class ImageConverterGUI:
                 self.output_entry.delete(0, tk.END)
                 self.output_entry.insert(0, new_output)
         else:
-            self.pdf_quality_combo.pack_forget()
-            self.ppt_layout_combo.pack(side=tk.LEFT, padx=(10, 0))
+            self.pdf_opts_frame.grid_remove()
+            self.ppt_opts_frame.grid()
             
             # 更新输出路径扩展名
             current_output = self.output_entry.get()
@@ -420,7 +640,7 @@ class ImageConverterGUI:
                 self.output_entry.insert(0, new_output)
     
     def start_conversion(self):
-        """开始转换（在独立线程中执行）"""
+        """开始转换（在转换线程中执行）"""
         # 验证输入
         if not self.image_files:
             messagebox.showwarning("警告", "没有可转换的图片文件！")
@@ -435,10 +655,31 @@ class ImageConverterGUI:
         self.convert_btn.config(state=tk.DISABLED)
         self.progress_var.set(0)
         
-        # 在新线程中执行转换
-        thread = threading.Thread(target=self.convert_images, args=(output_file,))
-        thread.daemon = True
-        thread.start()
+        # 提交到常驻的转换线程中执行
+        future = self._exec.submit(self.convert_images, output_file)
+        future.add_done_callback(self._on_done)
+    
+    def _on_done(self, future):
+        """转换任务结束（在转换线程中回调）"""
+        # 恢复按钮状态
+        if not self._closed.is_set():
+            self.root.after(0, lambda: self.convert_btn.config(state=tk.NORMAL))
+    
+    def on_close(self):
+        """关闭窗口：通知转换线程停止，取消排队中的任务后退出"""
+        self._closed.set()
+        self._exec.shutdown(wait=False, cancel_futures=True)
+        self.root.destroy()
+    
+    def _set_status(self, text, color):
+        """更新状态栏（窗口关闭后忽略）"""
+        if not self._closed.is_set():
+            self.status_label.config(text=text, foreground=color)
+    
+    def _set_progress(self, progress):
+        """更新进度条（窗口关闭后忽略）"""
+        if not self._closed.is_set():
+            self.root.after(0, lambda: self.progress_var.set(progress))
     
     def convert_images(self, output_file):
         """执行转换（在线程中运行）"""
@@ -450,19 +691,90 @@ class ImageConverterGUI:
             else:
                 self.convert_to_ppt(output_file)
             
+            if self._closed.is_set():
+                return
+            
             self.log(f"转换完成！输出文件: {output_file}")
-            self.status_label.config(text="转换成功！", foreground="green")
+            self._set_status("转换成功！", "green")
             messagebox.showinfo("完成", f"转换成功！\n输出文件: {output_file}")
             
         except Exception as e:
+            # 窗口关闭后Tk调用会失败，此时直接结束
+            if self._closed.is_set():
+                return
+            
             self.log(f"转换失败: {str(e)}")
-            self.status_label.config(text="转换失败", foreground="red")
+            self._set_status("转换失败", "red")
             messagebox.showerror("错误", f"转换失败！\n{str(e)}")
-        
-        finally:
-            # 恢复按钮状态
-            self.root.after(0, lambda: self.convert_btn.config(state=tk.NORMAL))
     
+    def _fitz(self):
+        """按需导入PyMuPDF"""
+        if self._fitz_mod is None:
+            import fitz  # PyMuPDF
+            self._fitz_mod = fitz
+        return self._fitz_mod
+    
+    def _pptx(self):
+        """按需导入python-pptx"""
+        if self._pptx_mod is None:
+            import pptx
+            import pptx.util
+            self._pptx_mod = pptx
+        return self._pptx_mod
+    
+    def _turbojpeg(self):
+        """按需加载可选的PyTurboJPEG，返回RGB图片的JPEG编码函数
+
+        未安装或找不到libturbojpeg时返回None，由PIL编码
+        """
+        if not self._tj_loaded:
+            self._tj_loaded = True
+            try:
+                import numpy as np
+                from turbojpeg import TurboJPEG, TJPF_RGB, TJSAMP_420
+                tj = TurboJPEG()
+            except (ImportError, OSError, RuntimeError):
+                return None
+            
+            def encode(img, quality):
+                # 色度抽样与PIL默认的4:2:0一致
+                return tj.encode(np.asarray(img), quality=quality,
+                                 pixel_format=TJPF_RGB, jpeg_subsample=TJSAMP_420)
+            
+            self._tj_encode = encode
+        return self._tj_encode
+    
+    def _encode_pdf_page(self, filepath, compression_type, quality, tj_encode=None):
+        """准备单个PDF页面的图片数据（在线程池中运行）
+
+        返回 (宽, 高, 透明度, 压缩后的JPEG数据)，无损模式下数据为None，直接嵌入原文件；
+        透明度为-1表示未知，由MuPDF自行判断
+        """
+        if compression_type == "lossless":
+            # 只读取文件头获取宽高（复用列表扫描时的缓存），不解码像素
+            width, height = _cached_dims(filepath, os.stat(filepath).st_mtime_ns)
+
+            # JPEG没有透明通道（按扩展名判断，不额外读取文件），其他格式由MuPDF自行判断
+            alpha = 0 if filepath.lower().endswith(('.jpg', '.jpeg')) else -1
+            return width, height, alpha, None
+
+        with Image.open(filepath) as img:
+            width, height = img.size
+
+            # JPEG只能保存RGB/灰度，其余模式（RGBA、CMYK、调色板等）转换为RGB
+            if img.mode not in ('RGB', 'L'):
+                img = img.convert('RGB')
+
+            # 优先使用libjpeg-turbo（SIMD加速）编码
+            if tj_encode is not None and img.mode == 'RGB':
+                return width, height, 0, tj_encode(img, quality)
+
+            # 保存为压缩的JPEG数据
+            # 不启用optimize/progressive：额外的霍夫曼优化遍历会使编码耗时翻倍，而文件仅小2~5%
+            img_buffer = io.BytesIO()
+            img.save(img_buffer, format='JPEG', quality=quality, optimize=False, progressive=False)
+            return width, height, 0, img_buffer.getvalue()
+
     def convert_to_pdf(self, output_file):
         """转换为PDF"""
         quality_mode = self.pdf_quality_var.get()
@@ -480,55 +792,67 @@ class ImageConverterGUI:
             quality = 30
 
         # 创建PDF文档
+        fitz = self._fitz()
         pdf_document = fitz.open()
 
-        total_files = len(self.image_files)
+        # 转换期间列表仍可编辑，使用开始时的文件列表快照
+        files = list(self.image_files)
+        total_files = len(files)
         total_size = 0
 
-        for i, filepath in enumerate(self.image_files):
-            filename = os.path.basename(filepath)
-            file_size = os.path.getsize(filepath)
-            total_size += file_size
+        # 图片解码/压缩在线程池中并行执行（PIL编解码时会释放GIL），
+        # 页面按原顺序在当前线程中依次插入PDF；最多提前准备2倍线程数的页面，限制内存占用
+        workers = os.cpu_count() or 1
+        tj_encode = self._turbojpeg() if compression_type == "compress" else None
+        encode = partial(self._encode_pdf_page, compression_type=compression_type,
+                         quality=quality, tj_encode=tj_encode)
+        with ThreadPoolExecutor(max_workers=workers) as executor, \
+                closing(_bounded_map(executor, encode, files, 2 * workers)) as pages:
+            for i, (filepath, future) in enumerate(zip(files, pages)):
+                # 窗口已关闭：放弃转换，退出时取消尚未开始的页面
+                if self._closed.is_set():
+                    pdf_document.close()
+                    return
 
-            self.log(f"处理 ({i+1}/{total_files}): {filename} [{quality_mode}]")
-            self.status_label.config(text=f"正在处理: {filename}", foreground="blue")
+                filename = os.path.basename(filepath)
+                file_size = os.path.getsize(filepath)
+                total_size += file_size
 
-            try:
-                with Image.open(filepath) as img:
-                    width, height = img.size
+                self.log(f"处理 ({i+1}/{total_files}): {filename} [{quality_mode}]")
+                self._set_status(f"正在处理: {filename}", "blue")
+
+                try:
+                    width, height, alpha, img_data = future.result()
+                    page = pdf_document.new_page(width=width, height=height)
 
-                    if compression_type == "lossless":
+                    if img_data is None:
                         # 无损模式：直接嵌入原始图片
-                        page = pdf_document.new_page(width=width, height=height)
-                        page.insert_image(page.rect, filename=filepath, overlay=False)
+                        page.insert_image(page.rect, filename=filepath,
+                                          width=width, height=height, alpha=alpha,
+                                          overlay=False)
                     else:
-                        # 压缩模式：先压缩再嵌入
-                        # 转换为RGB模式（PDF不支持RGBA）
-                        if img.mode == 'RGBA':
-                            img = img.convert('RGB')
-                        elif img.mode == 'CMYK':
-                            img = img.convert('RGB')
-
-                        # 保存为压缩的JPEG数据
-                        img_buffer = io.BytesIO()
-                        img.save(img_buffer, format='JPEG', quality=quality, optimize=True)
-                        img_data = img_buffer.getvalue()
-
-                        # 创建PDF页面并插入压缩后的图片
-                        page = pdf_document.new_page(width=width, height=height)
-                        page.insert_image(page.rect, stream=img_data, overlay=False)
-
-            except Exception as e:
-                self.log(f"  警告：无法处理图片: {e}")
-                continue
-
-            # 更新进度
-            progress = ((i + 1) / total_files) * 100
-            self.root.after(0, lambda p=progress: self.progress_var.set(p))
+                        # 压缩模式：插入压缩后的图片
+                        page.insert_image(page.rect, stream=img_data,
+                                          width=width, height=height, alpha=alpha,
+                                          overlay=False)
+
+                except Exception as e:
+                    self.log(f"  警告：无法处理图片: {e}")
+                    continue
+
+                # 更新进度
+                progress = ((i + 1) / total_files) * 100
+                self._set_progress(progress)
 
         # 保存PDF
         self.log("正在保存PDF文件...")
-        pdf_document.save(output_file)
+        # 清理无用对象、压缩非图片数据流；图片数据已压缩，不再重复deflate
+        save_options = dict(garbage=4, clean=True, deflate=True,
+                            deflate_images=False, deflate_fonts=True)
+        # 对象流压缩（use_objstms）需要MuPDF 1.24及以上版本
+        if tuple(int(v) for v in fitz.VersionBind.split('.')[:2]) >= OBJSTMS_MIN_VERSION:
+            save_options['use_objstms'] = 1
+        pdf_document.save(output_file, **save_options)
         pdf_document.close()
 
         output_size = os.path.getsize(output_file)
@@ -539,73 +863,98 @@ class ImageConverterGUI:
         self.log(f"  PDF大小: {output_size / (1024*1024):.2f} MB")
         self.log(f"  压缩比: {compression_ratio:.1f}%")
     
+    def _read_ppt_image(self, filepath):
+        """读取单张图片的数据和原始尺寸（在线程池中运行）
+
+        文件只从磁盘读取一次，尺寸解析和插入幻灯片共用同一份内存数据
+        """
+        with open(filepath, 'rb') as f:
+            img_stream = io.BytesIO(f.read())
+        
+        with Image.open(img_stream) as img:
+            size = img.size
+        
+        img_stream.seek(0)
+        return size, img_stream
+
     def convert_to_ppt(self, output_file):
         """转换为PPT"""
         self.log("开始转换为PPT...")
         
         # 创建演示文稿
-        prs = Presentation()
+        pptx = self._pptx()
+        Inches = pptx.util.Inches
+        prs = pptx.Presentation()
         
-        total_files = len(self.image_files)
+        # 转换期间列表仍可编辑，使用开始时的文件列表快照
+        files = list(self.image_files)
+        total_files = len(files)
         ppt_layout = self.ppt_layout_var.get()
-        
-        for i, filepath in enumerate(self.image_files):
-            filename = os.path.basename(filepath)
-            file_size = os.path.getsize(filepath) / (1024 * 1024)
-            
-            self.log(f"处理 ({i+1}/{total_files}): {filename}")
-            self.status_label.config(text=f"正在处理: {filename}", foreground="blue")
-            
-            # 获取图片尺寸
-            try:
-                with Image.open(filepath) as img:
-                    original_width, original_height = img.size
-            except Exception as e:
-                self.log(f"  警告：无法读取图片尺寸: {e}")
-                continue
-            
-            # 添加新幻灯片
-            slide_layout = prs.slide_layouts[6]  # 空白布局
-            slide = prs.slides.add_slide(slide_layout)
-            
-            # 根据选择的布局处理图片
-            if ppt_layout == "全屏填充":
-                # 全屏填充，保持比例
-                slide_width = prs.slide_width
-                slide_height = prs.slide_height
+        slide_layout = prs.slide_layouts[6]  # 空白布局
+        slide_width = prs.slide_width
+        slide_height = prs.slide_height
+        
+        # 在线程池中并行读取图片，幻灯片按原顺序在当前线程中生成；
+        # 最多提前读取2倍线程数的图片，避免整个文件夹同时载入内存
+        workers = os.cpu_count() or 1
+        with ThreadPoolExecutor(max_workers=workers) as executor, \
+                closing(_bounded_map(executor, self._read_ppt_image, files, 2 * workers)) as pages:
+            for i, (filepath, future) in enumerate(zip(files, pages)):
+                # 窗口已关闭：放弃转换，退出时取消尚未开始的图片
+                if self._closed.is_set():
+                    return
                 
-                ratio = min(slide_width / original_width, slide_height / original_height)
-                img_width = int(original_width * ratio)
-                img_height = int(original_height * ratio)
+                filename = os.path.basename(filepath)
                 
-                left = int((slide_width - img_width) / 2)
-                top = int((slide_height - img_height) / 2)
+                self.log(f"处理 ({i+1}/{total_files}): {filename}")
+                self._set_status(f"正在处理: {filename}", "blue")
                 
-            elif ppt_layout == "图片居中":
-                # 居中显示，保持原始大小
-                img_width = int(original_width)
-                img_height = int(original_height)
+                # 获取图片数据和尺寸
+                try:
+                    (original_width, original_height), img_stream = future.result()
+                except Exception as e:
+                    self.log(f"  警告：无法读取图片尺寸: {e}")
+                    continue
                 
-                left = int((prs.slide_width - img_width) / 2)
-                top = int((prs.slide_height - img_height) / 2)
+                # 添加新幻灯片
+                slide = prs.slides.add_slide(slide_layout)
                 
-            else:  # 空白页
-                # 直接使用原始尺寸
-                img_width = int(original_width)
-                img_height = int(original_height)
-                left = Inches(0.5)
-                top = Inches(0.5)
-            
-            # 插入图片
-            try:
-                slide.shapes.add_picture(filepath, left, top, width=img_width, height=img_height)
-            except Exception as e:
-                self.log(f"  警告：插入图片失败: {e}")
-                continue
-            
-            # 更新进度
-            progress = ((i + 1) / total_files) * 100
-            self.root.after(0, lambda p=progress: self.progress_var.set(p))
+                # 根据选择的布局处理图片
+                if ppt_layout == "全屏填充":
+                    # 全屏填充，保持比例
+                    ratio = min(slide_width / original_width, slide_height / original_height)
+                    img_width = int(original_width * ratio)
+                    img_height = int(original_height * ratio)
+                
+                    left = int((slide_width - img_width) / 2)
+                    top = int((slide_height - img_height) / 2)
+                
+                elif ppt_layout == "图片居中":
+                    # 居中显示，保持原始大小
+                    img_width = int(original_width)
+                    img_height = int(original_height)
+                
+                    left = int((slide_width - img_width) / 2)
+                    top = int((slide_height - img_height) / 2)
+                
+                else:  # 空白页
+                    # 直接使用原始尺寸
+                    img_width = int(original_width)
+                    img_height = int(original_height)
+                    left = Inches(0.5)
+                    top = Inches(0.5)
+                
+                # 插入图片
+                try:
+                    # 相同内容的图片由python-pptx按SHA1去重，只嵌入一份
+                    slide.shapes.add_picture(img_stream, left, top, width=img_width, height=img_height)
+                except Exception as e:
+                    self.log(f"  警告：插入图片失败: {e}")
+                    continue
+                
+                # 更新进度
+                progress = ((i + 1) / total_files) * 100
+                self._set_progress(progress)
         
         # 保存PPT
         self.log("正在保存PPT文件...")
@@ -617,9 +966,20 @@ class ImageConverterGUI:
         self.log(f"  PPT大小: {output_size / (1024*1024):.2f} MB")
     
     def log(self, message):
-        """添加日志"""
-        self.root.after(0, lambda: self.log_text.insert(tk.END, message + "\n"))
-        self.root.after(0, lambda: self.log_text.see(tk.END))
+        """添加日志（线程安全，由_flush_log定时写入界面）"""
+        self._log_q.append(message)
+    
+    def _flush_log(self):
+        """将待输出的日志一次性写入日志框"""
+        lines = []
+        while self._log_q:
+            lines.append(self._log_q.popleft())
+        
+        if lines:
+            self.log_text.insert(tk.END, "\n".join(lines) + "\n")
+            self.log_text.see(tk.END)
+        
+        self.root.after(LOG_FLUSH_INTERVAL_MS, self._flush_log)
 
 
 def main():